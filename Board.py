@@ -1,15 +1,36 @@
+from array import array
+
+from _focus_core import HEIGHT_SHIFT, stack_height, stack_colors
+
+# piece codes of the starting layout, row by row (1 = player 1, 2 = player 2)
+_LAYOUT_PATTERN = bytes([1, 1, 2, 2, 1, 1,
+                         2, 2, 1, 1, 2, 2,
+                         1, 1, 2, 2, 1, 1,
+                         2, 2, 1, 1, 2, 2,
+                         1, 1, 2, 2, 1, 1,
+                         2, 2, 1, 1, 2, 2])
+# the same layout as packed stacks of one piece each
+_STACK_PATTERN = array('H', [(1 << HEIGHT_SHIFT) | code for code in _LAYOUT_PATTERN])
+
+
 class Board:
     """
     Class represents the game board. Class is responsible for initializing an instance
     of itself, and providing the information it knows to the FocusGame class.
     Players and other classes interact with the board indirectly through FocusGame.
-    Class will also update itself as needed via valid actions from FocusGame
-    (such as updating its state due to Player moves). It does not need to
-    interact directly with Player--FocusGame will take care of that.
+    FocusGame updates the board's buffers in place (see get_buffers) as it carries
+    out valid actions, such as player moves. The board does not need to track
+    the players' reserves or captures--FocusGame will take care of that.
+
+    The board is stored as flat arrays indexed by row * 6 + col. Pieces are
+    encoded as small ints (0 = empty, 1 = player 1, 2 = player 2), and each
+    stack is packed into a 16 bit int (see _focus_core.pack_stack).
 
     Attributes
     ----------
-    board : the board, represented by a list of lists
+    top : code of the top piece of each tile
+    stacks : packed stack of each tile
+    color_of_code : table translating piece codes back to their colors
     """
 
     def __init__(self, p1_color, p2_color):
@@ -17,45 +38,38 @@ class Board:
         Initializes the game board per standard layout rules. Will create the
         pieces in the colors provided by players.
         """
-        self._board_layout = []
-        for i in range(6):
-            if i % 2 == 0:
-                self._board_layout.append([[p1_color], [p1_color], [p2_color], [p2_color], [p1_color], [p1_color]])
-            else:
-                self._board_layout.append([[p2_color], [p2_color], [p1_color], [p1_color], [p2_color], [p2_color]])
+        self._top = bytearray(_LAYOUT_PATTERN)
+        self._stacks = array('H', _STACK_PATTERN)
+        self._color_of_code = (None, p1_color, p2_color)
 
     def display_board(self):
         """
         Method prints board with layout of current pieces
         """
-        print()
-        for row in self._board_layout:
-            print(row)
-
-    def modify_tile(self, tile_coord, new_stack):
-        """
-        Method modifies the value at the indicated coordinates. Essentially it
-        changes the pieces in the stack to resolve various game actions.
-        :param tile_coord: tuple indicating which tile should be modified
-        :param new_stack: list containing stack values (pieces in stack)
-        """
-        row_coord = tile_coord[0]
-        col_coord = tile_coord[1]
-        self._board_layout[row_coord][col_coord] = new_stack
+        rows = [repr([self.return_stack((row, col)) for col in range(6)]) for row in range(6)]
+        print('\n' + '\n'.join(rows))
 
     def return_stack(self, tile_coord):
         """
         Method returns stack at a given tile. The bottom piece should be the 0th
         element in a list, with the other pieces in order (rising to top)
         :param tile_coord: the tile for which we want to see the stack of pieces. tuple
+        Coordinates must be on the board--callers check them.
         :return: return a list representing the stack of pieces at location
         """
         row_coord = tile_coord[0]
         col_coord = tile_coord[1]
+        assert 0 <= row_coord <= 5 and 0 <= col_coord <= 5
+
+        stack = self._stacks[row_coord * 6 + col_coord]
+        colors = stack_colors(stack)
+        return [self._color_of_code[(colors >> (2 * i)) & 3] for i in range(stack_height(stack))]
+
+    def get_buffers(self):
+        """
+        Method returns the raw board buffers, for use by the numeric core
+        (see _focus_core)
+        :return: tuple of (top piece codes, packed stacks)
+        """
+        return self._top, self._stacks
 
-        if 5 < row_coord or row_coord < 0:
-            return False
-        elif 5 < col_coord or col_coord < 0:
-            return False
-        else:
-            return self._board_layout[row_coord][col_coord]
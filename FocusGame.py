@@ -2,24 +2,29 @@
 # Date: 11/22/2020
 # Desc: File contains classes needed to play Focus Game board game
 
+from numbers import Integral
+
 from Board import Board
-from Player import Player
+from _focus_core import MOVE_OK, validate, apply_move, place_piece, store_stack
 
 
 class FocusGame:
     """
     This class represents the game Focus. It is the primary point of interaction
     for the user. It also governs almost all object-to-object interactions within
-    the program--for example, FocusGame will interact with both the Player and
-    Board classes to perform captures, rather than having these classes interact
-    directly.
+    the program--for example, FocusGame keeps track of each player's reserved and
+    captured pieces itself, and updates them as it moves pieces on the Board.
     Attributes
     ----------
-    current_player_turn : indicates which player's turn it is
-    game_state : indicates the game state--whether it is a draw, in progress,
-                 or a particular player has won
-    player1 : tuple representing name and color of first player (player who begins game)
-    player2 : tuple representing name and color of second player(player who acts second)
+    cur_is_p1 : indicates which player's turn it is (True for player 1)
+    game_state : indicates the game state--0 while in progress, 1 if player 1 has
+                 won, 2 if player 2 has won. Updated when a player captures pieces
+    p1_name, p1_code : name and piece code of first player (player who begins game)
+    p2_name, p2_code : name and piece code of second player (player who acts second)
+    win_msgs : message returned by the winning move, indexed by game_state
+    top, stacks : the board's buffers (see Board), used directly by the move methods
+    reserved : pieces each player holds in reserve, indexed by player (0 or 1)
+    captured : pieces each player has captured, indexed by player (0 or 1)
     """
 
     def __init__(self, player1, player2):
@@ -27,43 +32,53 @@ class FocusGame:
         Initializes the game. Assigns players and play order based on input. Sets
         game state to default value (in progress). Calls Board class to initialize board.
         """
-        player1_color = player1[1]
-        player2_color = player2[1]
-        player1_name = player1[0]
-        player2_name = player2[0]
-
-        self._board = Board(player1_color, player2_color)
-        self._current_player_turn = player1_name
-        self._player1 = Player(player1_name, player1_color)
-        self._player2 = Player(player2_name, player2_color)
-        self._game_state = 'IN PROGRESS'
-        self._players = {player1_name: self._player1, player2_name: self._player2}
+        self._p1_name = player1[0]
+        self._p2_name = player2[0]
+
+        # pieces are stored by player slot, not color, so both players may pick the same color
+        self._board = Board(player1[1], player2[1])
+        self._p1_code, self._p2_code = 1, 2
+        self._top, self._stacks = self._board.get_buffers()
+        self._cur_is_p1 = True
+        self._reserved = [0, 0]
+        self._captured = [0, 0]
+        self._game_state = 0
+        self._win_msgs = (None, f'{self._p1_name} wins', f'{self._p2_name} wins')
 
     def determine_game_state(self):
         """
-        Method determines game_state using rules of game.
-        Returns a string with one of the following values:
+        Method returns the game_state as a string with one of the following values:
         -IN PROGRESS
         -PLAYER 1 WINS
         -PLAYER 2 WINS
         :return: the game_state of the game
         """
-        if self._player1.get_captured() >= 6:
-            return 'PLAYER 1 WINS'
-        elif self._player2.get_captured() >= 6:
-            return 'PLAYER 2 WINS'
-        else:
-            return 'IN PROGRESS'
+        return ('IN PROGRESS', 'PLAYER 1 WINS', 'PLAYER 2 WINS')[self._game_state]
 
     def show_pieces(self, tile_coord):
         """
         Takes a tuple with board position coordinates and returns a list with the
         value of pieces at the position (as a list)
         :param tile_coord: tuple containing board position coordinates
-        :return: list showing number and ownership of pieces at position
+        :return: list showing number and ownership of pieces at position,
+                 False if the position is not on the board
         """
+        if not (0 <= tile_coord[0] <= 5 and 0 <= tile_coord[1] <= 5):
+            return False
+
         return self._board.return_stack(tile_coord)
 
+    def on_board(self, tile_coord):
+        """
+        Method checks that coordinates are a tile on the board: two integers from 0 to 5
+        :param tile_coord: tuple containing board position coordinates
+        :return: True if on the board, else False
+        """
+        row_coord = tile_coord[0]
+        col_coord = tile_coord[1]
+        return (isinstance(row_coord, Integral) and isinstance(col_coord, Integral)
+                and 0 <= row_coord <= 5 and 0 <= col_coord <= 5)
+
     def basic_move_validation(self, player_name, from_coordinates, to_coordinates, number_of_pieces):
         """
         Perform basic validations for attempted move. Following validations are made:
@@ -80,64 +95,22 @@ class FocusGame:
         :param number_of_pieces: number of pieces to move
         :return: True if valid, False if invalid
         """
-
-        # check if the coordinates are on the board. do this before other index manipulations to avoid errors
-        all_coords = [from_coordinates[0], from_coordinates[1], to_coordinates[0], to_coordinates[1]]
-        for coords in all_coords:
-            if coords not in (0, 1, 2, 3, 4, 5):
-                return False
-        # can't move if the game is over
-        if self._game_state != 'IN PROGRESS':
-            return False
-        # can't move if it's not your turn
-        if player_name != self._current_player_turn:
-            return False
-        # can't perform a one piece move if there is not a piece on the board
-        if number_of_pieces == 1 and len(self.show_pieces(from_coordinates)) == 0:
-            return False
-        # can't move a piece if it's not at the current location on the board
-        if len(self.show_pieces(from_coordinates)) == 0:
-            return False
-        # can't move if the top piece of the stack does not belong to current player
-        if self.show_pieces(from_coordinates)[-1] != self._players[player_name].get_color():
-            return False
-        # must move between 1 and (stack size) of pieces
-        if number_of_pieces < 0 or number_of_pieces > len(self.show_pieces(from_coordinates)):
-            return False
-        # can only move the same number of tiles as number of pieces to be moved
-        if abs(to_coordinates[0] - from_coordinates[0]) != number_of_pieces \
-                and abs(to_coordinates[1] - from_coordinates[1]) != number_of_pieces:
-            return False
-        # no diagonal moves
-        if to_coordinates[0] != from_coordinates[0] and to_coordinates[1] != to_coordinates[1]:
+        # the core only handles integers, so anything else is rejected here like any invalid move
+        if not (self.on_board(from_coordinates) and self.on_board(to_coordinates)
+                and isinstance(number_of_pieces, Integral) and 1 <= number_of_pieces <= 5):
             return False
+        # only the player whose turn it is can pass validation, so use their pieces
+        if self._cur_is_p1:
+            is_turn = player_name == self._p1_name
+            player_code = self._p1_code
+        else:
+            is_turn = player_name == self._p2_name
+            player_code = self._p2_code
+        result = validate(self._top, self._stacks, from_coordinates[0], from_coordinates[1],
+                          to_coordinates[0], to_coordinates[1], number_of_pieces,
+                          self._game_state == 0, is_turn, player_code)
 
-        return True
-
-    def resolve_stacks(self, input_stack, player_name):
-        """
-        Method is used to resolve stacks when the number of pieces exceeds 5.
-        :param player_name: the name of the player executing the move
-        :param input_stack: the stack to be resolved after move
-        :return: new stack to be placed on tile
-        """
-        pieces_to_resolve_cnt = len(input_stack) - 5
-        i = 0
-
-        player = self._players[player_name]
-
-        while i < pieces_to_resolve_cnt:
-            current_piece = input_stack[i]
-            i += 1
-
-            if current_piece == player.get_color():
-                player.add_to_reserve()
-            else:
-                player.add_to_captured()
-
-        new_stack = input_stack[pieces_to_resolve_cnt:]
-
-        return new_stack
+        return result == MOVE_OK
 
     def single_move(self, player_name, from_coordinates, to_coordinates):
         """
@@ -148,46 +121,33 @@ class FocusGame:
         :param from_coordinates: tuple indicating which piece is to be moved
         :param to_coordinates: tuple indicating which tile piece should move to
         """
-        player = self._players[player_name]
-        old_stack = self.show_pieces(from_coordinates)
-        old_stack = old_stack[0:len(old_stack) - 1]
-        new_stack = self.show_pieces(to_coordinates)
-        new_stack.append(player.get_color())
-
-        if len(new_stack) > 5:
-            new_stack = self.resolve_stacks(new_stack, player_name)
-
-        self._board.modify_tile(from_coordinates, old_stack)
-        self._board.modify_tile(to_coordinates, new_stack)
+        self.multiple_move(player_name, from_coordinates, to_coordinates, 1)
 
     def multiple_move(self, player_name, from_coordinates, to_coordinates, number_of_pieces):
         """
         Method helps move_piece by executing the logic for multipiece moves.
-        Method contains logic ot determine validity of move (for example,
-        the piece belongs to the moving player).
-        Returns True if move is valid, else return False.
+        The top number_of_pieces pieces of the source stack are placed on top of
+        the target stack. Move was already validated outside of method.
         :param player_name: player executing the move
         :param from_coordinates: tuple indicating which piece is to be moved
         :param to_coordinates: tuple indicating which tile piece should move to
         :param number_of_pieces: int indicating number of pieces to move
-        :return: boolean indicating whether move was successful
         """
-        new_stack = self.show_pieces(to_coordinates)
-        old_stack = self.show_pieces(from_coordinates)
-        old_stack = old_stack[0:len(old_stack) - number_of_pieces]
-        pieces_to_move = self.show_pieces(from_coordinates)[-number_of_pieces:]
-        new_stack.extend(pieces_to_move)
-
-        if len(new_stack) > 5:
-            new_stack = self.resolve_stacks(new_stack, player_name)
+        pid = 0 if player_name == self._p1_name else 1
+        player_code = self._p2_code if pid else self._p1_code
+        from_idx = from_coordinates[0] * 6 + from_coordinates[1]
+        to_idx = to_coordinates[0] * 6 + to_coordinates[1]
 
-        self._board.modify_tile(from_coordinates, old_stack)
-        self._board.modify_tile(to_coordinates, new_stack)
+        reserved, captured = apply_move(self._top, self._stacks, from_idx, to_idx, number_of_pieces, player_code)
+        self._reserved[pid] += reserved
+        self._captured[pid] += captured
+        if self._captured[pid] >= 6:
+            self._game_state = pid + 1
 
     def move_piece(self, player_name, from_coordinates, to_coordinates, number_of_pieces):
         """
-        Method moves player pieces. It will determine which kind of move is needed
-        (for example, single vs multiple) and call the relevant helping method.
+        Method moves player pieces. Single and multiple moves are both carried out
+        by multiple_move.
         Will resolve the outcome of the move (for example, if pieces are captured).
         Checks game_state at end of move to determine if player won.
         :param player_name: the player making the move
@@ -201,35 +161,102 @@ class FocusGame:
         if not self.basic_move_validation(player_name, from_coordinates, to_coordinates, number_of_pieces):
             return False
 
-        if number_of_pieces == 1:
-            self.single_move(player_name, from_coordinates, to_coordinates)
-            result = 'successfully moved'
-        else:
-            self.multiple_move(player_name, from_coordinates, to_coordinates, number_of_pieces)
-            result = 'successfully moved'
+        # a single move is a multiple move of one piece, so there's no need to dispatch on it
+        self.multiple_move(player_name, from_coordinates, to_coordinates, number_of_pieces)
 
-        if self._current_player_turn == self._player1.get_name():
-            self._current_player_turn = self._player2.get_name()
-        else:
-            self._current_player_turn = self._player1.get_name()
+        return self.end_turn('successfully moved')
 
-        self._game_state = self.determine_game_state()
+    def end_turn(self, result):
+        """
+        Method changes the turn to the other player after a move has been made.
+        :param result: message to return if the move did not win the game
+        :return: message indicating the player won, else result
+        """
+        self._cur_is_p1 = not self._cur_is_p1
 
-        if self._game_state in ('PLAYER 1 WINS', 'PLAYER 2 WINS'):
-            return f'{self._current_player_turn} wins'
+        if self._game_state:
+            return self._win_msgs[self._game_state]
         else:
             return result
 
+    def make_move(self, player_name, from_coordinates, to_coordinates, number_of_pieces):
+        """
+        Method makes a move like move_piece, but returns a token that undo_move can
+        use to take the move back. This lets a game tree search explore moves in
+        place instead of copying the game for every position.
+        :param player_name: the player making the move
+        :param from_coordinates: tuple indicating location on board that contains
+                                 moving piece
+        :param to_coordinates: tuple indicating location to move stack to
+        :param number_of_pieces: int representing the number of pieces to move
+        :return: undo token if the move was made, False if the move is invalid
+        """
+        if not self.basic_move_validation(player_name, from_coordinates, to_coordinates, number_of_pieces):
+            return False
+
+        from_idx = from_coordinates[0] * 6 + from_coordinates[1]
+        to_idx = to_coordinates[0] * 6 + to_coordinates[1]
+        token = self.undo_token(from_idx, to_idx)
+        self.multiple_move(player_name, from_coordinates, to_coordinates, number_of_pieces)
+        self.end_turn(True)
+
+        return token
+
+    def make_reserved_move(self, player_name, to_coordinates):
+        """
+        Method makes a reserve move like reserved_move, but returns a token that
+        undo_move can use to take the move back (see make_move).
+        :param player_name: string representing player making move
+        :param to_coordinates: tuple indicating position on board to play piece from reserve
+        :return: undo token if the move was made, False if the move is invalid
+        """
+        # the token needs a tile on the board, reserved_move checks everything else
+        if not self.on_board(to_coordinates):
+            return False
+
+        to_idx = to_coordinates[0] * 6 + to_coordinates[1]
+        token = self.undo_token(to_idx, to_idx)
+        if not self.reserved_move(player_name, to_coordinates):
+            return False
+
+        return token
+
+    def undo_token(self, from_idx, to_idx):
+        """
+        Method records everything a move can change: the stacks on the two tiles
+        it touches, both players' reserves and captures, the turn and the game state.
+        :param from_idx: flat index (row * 6 + col) of the tile the move takes pieces from
+        :param to_idx: flat index (row * 6 + col) of the tile the move puts pieces on
+        :return: tuple to be passed to undo_move
+        """
+        return (from_idx, self._stacks[from_idx], to_idx, self._stacks[to_idx],
+                tuple(self._reserved), tuple(self._captured), self._cur_is_p1, self._game_state)
+
+    def undo_move(self, token):
+        """
+        Method takes back a move made with make_move or make_reserved_move. Moves
+        must be undone in the reverse order they were made.
+        :param token: undo token returned when the move was made
+        """
+        from_idx, from_stack, to_idx, to_stack, reserved, captured, cur_is_p1, game_state = token
+
+        store_stack(self._top, self._stacks, from_idx, from_stack)
+        store_stack(self._top, self._stacks, to_idx, to_stack)
+        self._reserved[:] = reserved
+        self._captured[:] = captured
+        self._cur_is_p1 = cur_is_p1
+        self._game_state = game_state
+
     def show_reserve(self, player_name):
         """
         Method takes player name and returns the count of pieces player has in reserve
         :param player_name: player name as string
         :return: count (int) of pieces in reserve
         """
-        if self._player1.get_name() == player_name:
-            return self._player1.get_reserve()
-        elif self._player2.get_name() == player_name:
-            return self._player2.get_reserve()
+        if self._p1_name == player_name:
+            return self._reserved[0]
+        elif self._p2_name == player_name:
+            return self._reserved[1]
         else:
             return False
 
@@ -240,10 +267,10 @@ class FocusGame:
         :return: count (int) of pieces captured
         """
 
-        if self._player1.get_name() == player_name:
-            return self._player1.get_captured()
-        elif self._player2.get_name() == player_name:
-            return self._player2.get_captured()
+        if self._p1_name == player_name:
+            return self._captured[0]
+        elif self._p2_name == player_name:
+            return self._captured[1]
         else:
             return False
 
@@ -255,41 +282,28 @@ class FocusGame:
         :param to_coordinates: tuple indicating position on board to play piece from reserve
         :return: message if move fails, else None
         """
-        player = self._players[player_name]
-        to_stack = self.show_pieces(to_coordinates)
+        pid = 0 if player_name == self._p1_name else 1
 
         # validation
-        if player.get_reserve() == 0:
+        if self._reserved[pid] == 0:
             return False
 
-        if player_name != self._current_player_turn:
+        if player_name != (self._p1_name if self._cur_is_p1 else self._p2_name):
             return False
-        all_coords = [to_coordinates[0], to_coordinates[1]]
 
-        for coords in all_coords:
-            if coords not in (0, 1, 2, 3, 4, 5):
-                return False
+        if not self.on_board(to_coordinates):
+            return False
 
         # execute reserve
-        player.play_from_reserve()
-        new_stack = to_stack
-        new_stack.append(player.get_color())
-        if len(new_stack) > 5:
-            new_stack = self.resolve_stacks(new_stack, player_name)
-        self._board.modify_tile(to_coordinates, new_stack)
-
-        # change turn and set gamestate
-        if self._current_player_turn == self._player1.get_name():
-            self._current_player_turn = self._player2.get_name()
-        else:
-            self._current_player_turn = self._player1.get_name()
-
-        self._game_state = self.determine_game_state()
-
-        if self._game_state in ('PLAYER 1 WINS', 'PLAYER 2 WINS'):
-            return f'{self._current_player_turn} wins'
-        else:
-            return True
+        player_code = self._p2_code if pid else self._p1_code
+        to_idx = to_coordinates[0] * 6 + to_coordinates[1]
+        reserved, captured = place_piece(self._top, self._stacks, to_idx, player_code)
+        self._reserved[pid] += reserved - 1
+        self._captured[pid] += captured
+        if self._captured[pid] >= 6:
+            self._game_state = pid + 1
+
+        return self.end_turn(True)
 
     def display_board(self):
         """
@@ -0,0 +1,86 @@
+# Desc: Batched moves for the Focus game, for searches and simulations that play
+#       many boards at once. This is the only module that imports numba, so the
+#       game itself stays quick to import. numba is optional--without it the batch
+#       runs as plain Python.
+#
+#       Only simulate_batch is jitted. The core functions it calls are registered
+#       with register_jitable, which compiles them inline into the kernel while
+#       leaving them plain Python for FocusGame (numba's per-call dispatch costs
+#       more than the dozen int ops they do).
+
+import _focus_core
+from _focus_core import MOVE_OK, validate, apply_move
+
+try:
+    from numba import njit, prange
+    from numba.extending import register_jitable
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        """
+        Stand-in for numba.njit when numba is not installed. Returns the
+        decorated function unchanged.
+        """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    def register_jitable(func):
+        """
+        Stand-in for numba.extending.register_jitable when numba is not
+        installed. Returns the function unchanged.
+        """
+        return func
+
+for _func in (_focus_core.pack_stack, _focus_core.stack_height, _focus_core.stack_colors,
+              _focus_core.stack_top, _focus_core.store_stack, _focus_core.validate,
+              _focus_core.resolve_stack, _focus_core.apply_move):
+    register_jitable(_func)
+
+
+def pack_move(from_idx, to_idx, number_of_pieces, player_code):
+    """
+    Packs a move into a single int, for use with simulate_batch
+    :param from_idx: flat index of the tile to move pieces from
+    :param to_idx: flat index of the tile to move pieces to
+    :param number_of_pieces: number of pieces to move
+    :param player_code: piece code of the moving player
+    :return: packed move
+    """
+    return from_idx | (to_idx << 8) | (number_of_pieces << 16) | (player_code << 24)
+
+
+@njit(parallel=True, cache=True)
+def simulate_batch(tops, stacks, moves, out_deltas):
+    """
+    Applies one move to each board of a batch. With numba the boards are spread
+    across cores, since each move only touches its own board. Moves are fully
+    validated, including packed indices that fall off the board.
+    With numba, pass numpy arrays (uint8 tops, uint16 stacks). Without numba, pass
+    rows that index to Python ints (e.g. lists of bytearray and array('H')), since
+    numpy's fixed-width scalars would overflow the packed stack arithmetic.
+    :param tops: top piece codes of each board, shape (N, 36)
+    :param stacks: packed stacks of each board, shape (N, 36)
+    :param moves: packed move for each board (see pack_move), shape (N,)
+    :param out_deltas: receives (pieces reserved, pieces captured) for each board,
+                       or (-1, -1) if its move is invalid. shape (N, 2). Must be a
+                       signed type, or the -1 for invalid moves wraps around silently
+    """
+    for k in prange(len(moves)):
+        move = int(moves[k])
+        from_idx = move & 0xFF
+        to_idx = (move >> 8) & 0xFF
+        number_of_pieces = (move >> 16) & 0xFF
+        player_code = (move >> 24) & 0xFF
+
+        result = validate(tops[k], stacks[k], from_idx // 6, from_idx % 6, to_idx // 6, to_idx % 6,
+                          number_of_pieces, True, True, player_code)
+        if result != MOVE_OK:
+            out_deltas[k][0] = -1
+            out_deltas[k][1] = -1
+            continue
+
+        reserved, captured = apply_move(tops[k], stacks[k], from_idx, to_idx, number_of_pieces, player_code)
+        out_deltas[k][0] = reserved
+        out_deltas[k][1] = captured
@@ -0,0 +1,176 @@
+# Desc: Numeric core of the Focus game. Functions here only work on ints and on
+#       the board's flat buffers (see Board). FocusGame calls them as plain Python,
+#       one move at a time. _focus_batch compiles them with numba for batches of
+#       boards, so importing the game never pays for importing numba.
+
+# a stack is packed into 16 bits: the height in bits 10-12, and 2 bits per piece
+# below that, with the bottom piece in bits 0-1
+HEIGHT_SHIFT = 10
+COLOR_MASK = 0x3FF
+
+# results of validate
+MOVE_OK = 0
+GAME_OVER = 1
+NOT_YOUR_TURN = 2
+INVALID_LOCATION = 3
+INVALID_PIECES = 4
+
+
+def pack_stack(height, colors):
+    """
+    Packs a stack height and its piece codes into a single int
+    :param height: number of pieces in stack
+    :param colors: piece codes, 2 bits each, bottom piece in the lowest bits
+    :return: packed stack
+    """
+    return (height << HEIGHT_SHIFT) | colors
+
+
+def stack_height(stack):
+    """
+    Returns the number of pieces in a packed stack
+    """
+    return stack >> HEIGHT_SHIFT
+
+
+def stack_colors(stack):
+    """
+    Returns the piece codes of a packed stack, bottom piece in the lowest bits
+    """
+    return stack & COLOR_MASK
+
+
+def stack_top(stack):
+    """
+    Returns the code of the top piece of a packed stack, or 0 if it is empty
+    """
+    height = stack >> HEIGHT_SHIFT
+    if height == 0:
+        return 0
+    return (stack >> (2 * height - 2)) & 3
+
+
+def store_stack(top, stacks, idx, stack):
+    """
+    Writes a packed stack to a tile, keeping the top piece buffer in sync
+    :param top: board buffer of top piece codes
+    :param stacks: board buffer of packed stacks
+    :param idx: flat index of the tile (row * 6 + col)
+    :param stack: packed stack, at most 5 pieces high
+    """
+    stacks[idx] = stack
+    top[idx] = stack_top(stack)
+
+
+def validate(top, stacks, from_r, from_c, to_r, to_c, number_of_pieces, in_progress, is_turn, player_code):
+    """
+    Performs the basic validations for a move (see FocusGame.basic_move_validation)
+    :param top: board buffer of top piece codes
+    :param stacks: board buffer of packed stacks
+    :param from_r, from_c: tile to move pieces from
+    :param to_r, to_c: tile to move pieces to
+    :param number_of_pieces: number of pieces to move
+    :param in_progress: whether the game is still in progress
+    :param is_turn: whether it is the moving player's turn
+    :param player_code: piece code of the moving player
+    :return: MOVE_OK if valid, else the code of the failed validation
+    """
+    # cheapest checks first: game state and turn need no coordinates or board reads
+    if not in_progress:
+        return GAME_OVER
+    if not is_turn:
+        return NOT_YOUR_TURN
+    if not (0 <= from_r <= 5 and 0 <= from_c <= 5 and 0 <= to_r <= 5 and 0 <= to_c <= 5):
+        return INVALID_LOCATION
+    # moves go along exactly one axis (no diagonals), as many tiles as pieces moved.
+    # this also makes sure at least one piece is moved
+    row_delta = to_r - from_r
+    col_delta = to_c - from_c
+    if (row_delta != 0) == (col_delta != 0):
+        return INVALID_LOCATION
+    if abs(row_delta) + abs(col_delta) != number_of_pieces:
+        return INVALID_PIECES
+    # the board is only read once the move itself makes sense. an empty tile has
+    # no top piece, so it fails the ownership check
+    from_idx = from_r * 6 + from_c
+    if top[from_idx] != player_code:
+        return INVALID_LOCATION
+    if number_of_pieces > stack_height(stacks[from_idx]):
+        return INVALID_PIECES
+    return MOVE_OK
+
+
+def resolve_stack(height, colors, player_code):
+    """
+    Removes pieces from the bottom of a stack until at most 5 remain. Removed
+    pieces of the moving player go to reserve, the others are captured.
+    :param height: number of pieces in the stack
+    :param colors: piece codes of the stack, bottom piece in the lowest bits
+    :param player_code: piece code of the moving player
+    :return: tuple of (packed stack, pieces reserved, pieces captured)
+    """
+    # most overflows are a single piece landing on a full stack
+    if height == 6:
+        if colors & 3 == player_code:
+            return pack_stack(5, colors >> 2), 1, 0
+        return pack_stack(5, colors >> 2), 0, 1
+
+    reserved = 0
+    captured = 0
+    while height > 5:
+        if colors & 3 == player_code:
+            reserved += 1
+        else:
+            captured += 1
+        colors >>= 2
+        height -= 1
+    return pack_stack(height, colors), reserved, captured
+
+
+def apply_move(top, stacks, from_idx, to_idx, number_of_pieces, player_code):
+    """
+    Moves the top number_of_pieces pieces of one stack onto another and
+    resolves the resulting stack. Move must already be validated.
+    :param top: board buffer of top piece codes
+    :param stacks: board buffer of packed stacks
+    :param from_idx: flat index of the tile to move pieces from
+    :param to_idx: flat index of the tile to move pieces to
+    :param number_of_pieces: number of pieces to move
+    :param player_code: piece code of the moving player
+    :return: tuple of (pieces reserved, pieces captured)
+    """
+    from_stack = stacks[from_idx]
+    to_stack = stacks[to_idx]
+
+    # the pieces above split move, the ones below it stay behind
+    split = stack_height(from_stack) - number_of_pieces
+    from_colors = stack_colors(from_stack)
+    moving = from_colors >> (2 * split)
+    left = from_colors ^ (moving << (2 * split))
+    to_height = stack_height(to_stack)
+    new_colors = stack_colors(to_stack) | (moving << (2 * to_height))
+
+    new_stack, reserved, captured = resolve_stack(to_height + number_of_pieces, new_colors, player_code)
+    store_stack(top, stacks, from_idx, pack_stack(split, left))
+    store_stack(top, stacks, to_idx, new_stack)
+    return reserved, captured
+
+
+def place_piece(top, stacks, idx, player_code):
+    """
+    Places one of the moving player's pieces on top of a stack (a reserve move)
+    and resolves the resulting stack. Move must already be validated.
+    :param top: board buffer of top piece codes
+    :param stacks: board buffer of packed stacks
+    :param idx: flat index of the tile to place the piece on
+    :param player_code: piece code of the moving player
+    :return: tuple of (pieces reserved, pieces captured)
+    """
+    stack = stacks[idx]
+    height = stack_height(stack)
+    new_colors = stack_colors(stack) | (player_code << (2 * height))
+
+    new_stack, reserved, captured = resolve_stack(height + 1, new_colors, player_code)
+    store_stack(top, stacks, idx, new_stack)
+    return reserved, captured
+
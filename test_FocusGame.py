@@ -0,0 +1,184 @@
+import random
+import unittest
+
+from FocusGame import FocusGame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def snapshot(game):
+    """
+    Returns everything a move can change: every tile, both players' reserves and
+    captures, the turn and the game state
+    """
+    tiles = [game.show_pieces((row, col)) for row in range(6) for col in range(6)]
+    counts = [game.show_reserve(name) for name in 'AB'] + [game.show_captured(name) for name in 'AB']
+    return tiles, counts, game._cur_is_p1, game.determine_game_state()
+
+
+def random_move(game, rng):
+    """
+    Picks a random straight move of one of the current player's stacks, moving as
+    many pieces as tiles travelled. The target may be off the board.
+    Players must be ('A', 'R') and ('B', 'G').
+    :return: tuple of (player name, from coordinates, to coordinates, number of pieces),
+             or None if the current player has no stack to move
+    """
+    name, color = ('A', 'R') if game._cur_is_p1 else ('B', 'G')
+    tiles = [game.show_pieces(divmod(idx, 6)) for idx in range(36)]
+    own = [divmod(idx, 6) for idx, stack in enumerate(tiles) if stack and stack[-1] == color]
+    if not own:
+        return None
+    row, col = rng.choice(own)
+    distance = rng.randint(1, len(tiles[row * 6 + col]))
+    row_delta, col_delta = rng.choice(((distance, 0), (-distance, 0), (0, distance), (0, -distance)))
+    return name, (row, col), (row + row_delta, col + col_delta), distance
+
+
+class TestMakeUndoMove(unittest.TestCase):
+    """
+    make_move/make_reserved_move must match move_piece/reserved_move, and undo_move
+    must restore the game exactly, one move at a time in reverse order
+    """
+
+    def play(self, seed):
+        """
+        Plays a random game with make_move/make_reserved_move, alongside a reference
+        game using move_piece/reserved_move, then undoes every move
+        """
+        rng = random.Random(seed)
+        game = FocusGame(('A', 'R'), ('B', 'G'))
+        reference = FocusGame(('A', 'R'), ('B', 'G'))
+        tokens = []
+        snapshots = [snapshot(game)]
+
+        for _ in range(300):
+            name = 'A' if game._cur_is_p1 else 'B'
+            if game.show_reserve(name) and rng.random() < 0.3:
+                to_coordinates = (rng.randint(0, 5), rng.randint(0, 5))
+                token = game.make_reserved_move(name, to_coordinates)
+                result = reference.reserved_move(name, to_coordinates)
+            else:
+                move = random_move(game, rng)
+                if move is None:
+                    break
+                token = game.make_move(*move)
+                result = reference.move_piece(*move)
+
+            self.assertEqual(token is False, result is False)
+            self.assertEqual(snapshot(game), snapshot(reference))
+            if token is not False:
+                tokens.append(token)
+                snapshots.append(snapshot(game))
+
+        while tokens:
+            game.undo_move(tokens.pop())
+            snapshots.pop()
+            self.assertEqual(snapshot(game), snapshots[-1])
+
+        return reference
+
+    def test_round_trip(self):
+        captured = 0
+        for seed in range(20):
+            reference = self.play(seed)
+            captured += reference.show_captured('A') + reference.show_captured('B')
+        # make sure the games got far enough to capture pieces
+        self.assertGreater(captured, 0)
+
+    def test_invalid_move_returns_false(self):
+        game = FocusGame(('A', 'R'), ('B', 'G'))
+        before = snapshot(game)
+        self.assertFalse(game.make_move('A', (0, 0), (1, 1), 1))
+        self.assertFalse(game.make_move('B', (0, 2), (0, 3), 1))
+        self.assertFalse(game.make_reserved_move('A', (0, 0)))
+        self.assertFalse(game.make_reserved_move('A', (6, 0)))
+        self.assertEqual(snapshot(game), before)
+
+
+class TestMoveValidation(unittest.TestCase):
+    """
+    move_piece must reject invalid moves with False and leave the game unchanged
+    """
+
+    def test_straight_moves_only(self):
+        game = FocusGame(('A', 'R'), ('B', 'G'))
+        self.assertEqual(game.move_piece('A', (0, 0), (0, 1), 1), 'successfully moved')
+
+        before = snapshot(game)
+        self.assertFalse(game.move_piece('B', (0, 2), (1, 3), 1))   # diagonal
+        self.assertFalse(game.move_piece('B', (0, 2), (0, 2), 0))   # no pieces, same tile
+        self.assertFalse(game.move_piece('B', (0, 2), (0, 4), 1))   # distance is not number_of_pieces
+        self.assertEqual(snapshot(game), before)
+        self.assertEqual(game.move_piece('B', (0, 2), (0, 3), 1), 'successfully moved')
+
+        # A's stack at (0, 1) is two pieces high, so it moves exactly two tiles
+        before = snapshot(game)
+        self.assertFalse(game.move_piece('A', (0, 1), (0, 2), 2))
+        self.assertEqual(snapshot(game), before)
+        self.assertEqual(game.move_piece('A', (0, 1), (2, 1), 2), 'successfully moved')
+        self.assertEqual(game.show_pieces((0, 1)), [])
+        self.assertEqual(game.show_pieces((2, 1)), ['R', 'R', 'R'])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy_ints(self):
+        game = FocusGame(('A', 'R'), ('B', 'G'))
+        i = numpy.int64
+        self.assertEqual(game.move_piece('A', (i(0), i(0)), (i(0), i(1)), i(1)), 'successfully moved')
+        self.assertEqual(game.show_pieces((0, 1)), ['R', 'R'])
+
+    def test_non_integer_arguments(self):
+        game = FocusGame(('A', 'R'), ('B', 'G'))
+        before = snapshot(game)
+        self.assertFalse(game.move_piece('A', (0.0, 0), (0, 1), 1))
+        self.assertFalse(game.move_piece('A', (0, 0), (0, 1), 1.0))
+        self.assertFalse(game.move_piece('A', (0, 0), ('0', 1), 1))
+        self.assertEqual(snapshot(game), before)
+
+
+class TestWin(unittest.TestCase):
+    """
+    The move that captures a player's sixth piece wins the game, and no moves can
+    be made after that
+    """
+
+    def test_capture_win(self):
+        winners = set()
+        for seed in range(2):
+            rng = random.Random(seed)
+            game = FocusGame(('A', 'R'), ('B', 'G'))
+            result = None
+            while not (isinstance(result, str) and result.endswith('wins')):
+                move = random_move(game, rng)
+                self.assertIsNotNone(move)
+                result = game.move_piece(*move)
+
+            mover = move[0]
+            winners.add(mover)
+            self.assertEqual(result, f'{mover} wins')
+            self.assertGreaterEqual(game.show_captured(mover), 6)
+            self.assertEqual(game.determine_game_state(), 'PLAYER 1 WINS' if mover == 'A' else 'PLAYER 2 WINS')
+            for _ in range(20):
+                self.assertFalse(game.move_piece(*random_move(game, rng)))
+        # seeds are picked so that each player wins one game
+        self.assertEqual(winners, {'A', 'B'})
+
+
+class TestSameColor(unittest.TestCase):
+    """
+    Pieces belong to a player slot, so both players may pick the same color
+    """
+
+    def test_move_with_same_color(self):
+        game = FocusGame(('PlayerA', 'R'), ('PlayerB', 'R'))
+        self.assertEqual(game.move_piece('PlayerA', (0, 0), (0, 1), 1), 'successfully moved')
+        self.assertEqual(game.show_pieces((0, 1)), ['R', 'R'])
+        self.assertFalse(game.move_piece('PlayerB', (0, 1), (0, 2), 1))
+        self.assertEqual(game.move_piece('PlayerB', (0, 2), (0, 3), 1), 'successfully moved')
+
+
+if __name__ == '__main__':
+    unittest.main()
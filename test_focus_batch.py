@@ -0,0 +1,107 @@
+import random
+import unittest
+from array import array
+
+import _focus_batch
+from FocusGame import FocusGame
+from _focus_batch import pack_move
+from test_FocusGame import random_move
+
+try:
+    import numba  # noqa: F401  (simulate_batch is only jitted when numba is installed)
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def random_moves(game, rng, count):
+    """
+    Makes up to count random valid moves on game, so the batch starts from varied boards
+    """
+    for _ in range(count):
+        move = random_move(game, rng)
+        if move is None:
+            return
+        game.move_piece(*move)
+
+
+def to_batch(games):
+    """
+    Copies the boards of games into the batch layout simulate_batch takes
+    """
+    if numpy is not None:
+        tops = numpy.array([list(game._top) for game in games], dtype=numpy.uint8)
+        stacks = numpy.array([list(game._stacks) for game in games], dtype=numpy.uint16)
+        out_deltas = numpy.zeros((len(games), 2), dtype=numpy.int64)
+    else:
+        tops = [bytearray(game._top) for game in games]
+        stacks = [array('H', game._stacks) for game in games]
+        out_deltas = [[0, 0] for _ in games]
+    return tops, stacks, out_deltas
+
+
+class TestSimulateBatch(unittest.TestCase):
+    """
+    simulate_batch must give the same boards and reserve/capture counts as making
+    each move with FocusGame.multiple_move, and must flag invalid moves with -1
+    """
+
+    def test_matches_multiple_move(self):
+        rng = random.Random(0)
+        games = []
+        for _ in range(40):
+            game = FocusGame(('A', 'R'), ('B', 'G'))
+            random_moves(game, rng, rng.randint(0, 40))
+            games.append(game)
+
+        # pick a move of the current player's top piece on each board
+        moves = []
+        for game in games:
+            player_code = 1 if game._cur_is_p1 else 2
+            idx = rng.choice([idx for idx in range(36) if game._top[idx] == player_code])
+            row, col = divmod(idx, 6)
+            number_of_pieces = rng.randint(1, len(game.show_pieces((row, col))))
+            targets = [(row + row_delta, col + col_delta)
+                       for row_delta, col_delta in ((number_of_pieces, 0), (-number_of_pieces, 0),
+                                                    (0, number_of_pieces), (0, -number_of_pieces))
+                       if 0 <= row + row_delta <= 5 and 0 <= col + col_delta <= 5]
+            to_row, to_col = rng.choice(targets)
+            moves.append((idx, to_row * 6 + to_col, number_of_pieces, player_code))
+
+        tops, stacks, out_deltas = to_batch(games)
+        packed = [pack_move(*move) for move in moves]
+        if numpy is not None:
+            packed = numpy.array(packed, dtype=numpy.uint32)
+        _focus_batch.simulate_batch(tops, stacks, packed, out_deltas)
+
+        for k, game in enumerate(games):
+            from_idx, to_idx, number_of_pieces, player_code = moves[k]
+            name = 'A' if player_code == 1 else 'B'
+            before = (game.show_reserve(name), game.show_captured(name))
+            game.multiple_move(name, divmod(from_idx, 6), divmod(to_idx, 6), number_of_pieces)
+            after = (game.show_reserve(name), game.show_captured(name))
+
+            self.assertEqual((int(out_deltas[k][0]), int(out_deltas[k][1])),
+                             (after[0] - before[0], after[1] - before[1]))
+            self.assertEqual(list(tops[k]), list(game._top))
+            self.assertEqual(list(stacks[k]), list(game._stacks))
+
+    def test_invalid_moves(self):
+        games = [FocusGame(('A', 'R'), ('B', 'G')) for _ in range(4)]
+        moves = [pack_move(0, 7, 1, 1),     # diagonal
+                 pack_move(0, 1, 1, 2),     # top piece belongs to the other player
+                 pack_move(5, 41, 1, 1),    # target index off the board
+                 pack_move(0, 2, 2, 1)]     # more pieces than the stack holds
+        tops, stacks, out_deltas = to_batch(games)
+        if numpy is not None:
+            moves = numpy.array(moves, dtype=numpy.uint32)
+        _focus_batch.simulate_batch(tops, stacks, moves, out_deltas)
+
+        for k, game in enumerate(games):
+            self.assertEqual((int(out_deltas[k][0]), int(out_deltas[k][1])), (-1, -1))
+            self.assertEqual(list(tops[k]), list(game._top))
+            self.assertEqual(list(stacks[k]), list(game._stacks))
+
+
+if __name__ == '__main__':
+    unittest.main()